@@ -0,0 +1,59 @@
+"""
+Compiled inner loops for the detector hot path
+Uses Numba when it is installed, otherwise equivalent numpy code
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def roi_total_area(labels, num_labels, roi_coords, min_area):
+        """Per ROI, sum the pixels of every blob whose part inside the ROI covers >= min_area"""
+        totals = np.zeros(roi_coords.shape[0], dtype=np.int64)
+        counts = np.zeros(num_labels, dtype=np.int64)
+        for r in range(roi_coords.shape[0]):
+            counts[:] = 0
+            x1 = max(roi_coords[r, 0], 0)
+            y1 = max(roi_coords[r, 1], 0)
+            x2 = min(roi_coords[r, 2], labels.shape[1])
+            y2 = min(roi_coords[r, 3], labels.shape[0])
+            for y in range(y1, y2):
+                for x in range(x1, x2):
+                    counts[labels[y, x]] += 1
+            for b in range(1, num_labels):  # Label 0 is the background
+                if counts[b] >= min_area:
+                    totals[r] += counts[b]
+        return totals
+else:
+    def roi_total_area(labels, num_labels, roi_coords, min_area):
+        """Per ROI, sum the pixels of every blob whose part inside the ROI covers >= min_area"""
+        totals = np.zeros(roi_coords.shape[0], dtype=np.int64)
+        for r, (x1, y1, x2, y2) in enumerate(roi_coords):
+            roi_labels = labels[max(y1, 0):y2, max(x1, 0):x2]
+            counts = np.bincount(roi_labels.ravel(), minlength=num_labels)[1:]  # Drop the background
+            totals[r] = counts[counts >= min_area].sum()
+        return totals
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def collect_motion_ids(roi_ids, roi_motion, out):
+        """Write the ids of ROIs flagged with motion into out; returns how many"""
+        n = 0
+        for i in range(roi_ids.shape[0]):
+            if roi_motion[i]:
+                out[n] = roi_ids[i]
+                n += 1
+        return n
+else:
+    def collect_motion_ids(roi_ids, roi_motion, out):
+        """Write the ids of ROIs flagged with motion into out; returns how many"""
+        selected = roi_ids[roi_motion]
+        out[:selected.size] = selected
+        return selected.size
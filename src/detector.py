@@ -9,16 +9,24 @@ import numpy as np
 import time
 from datetime import datetime
 import json
+import os
 from pathlib import Path
 import logging
 import subprocess
+import signal
+import tempfile
 import platform
 import threading
+from collections import deque
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from ._fastpath import collect_motion_ids, roi_total_area
+
+# Logging is configured by the application (see web/app.py)
 logger = logging.getLogger(__name__)
 
+# Number of set bits for every uint8 motion-history mask
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
 class DetectorConfig:
     """Configuration class for detector settings"""
     
@@ -27,12 +35,14 @@ class DetectorConfig:
         self.motion_threshold = 800
         self.min_contour_area = 1500
         self.max_small_contours = 50
-        self.motion_smoothing_frames = 3
+        self.motion_smoothing_frames = 3  # At most 8 (history is an 8-bit mask)
+        self.detect_scale = 0.5  # Motion is analysed on a downscaled frame
+        self.max_frame_skip = 10  # Upper bound of the adaptive stride between analysed frames
         
         # Background subtractor settings
         self.bg_history = 300
         self.bg_var_threshold = 100
-        self.bg_detect_shadows = True
+        self.bg_detect_shadows = False  # Shadow pixels would count as foreground
         
         # ROI settings
         self.max_rois = 4
@@ -41,77 +51,222 @@ class DetectorConfig:
         # Notification settings
         self.notification_cooldown = 2.0
         
+        # Acceleration settings
+        self.use_cuda = True  # Use CUDA background subtraction when a GPU is present
+        self.use_opencl = True  # Otherwise use the OpenCL T-API when a device is present
+        
         # System settings
         self.prevent_sleep = True
-        self.sleep_prevention_interval = 30  # seconds
 
 class SleepPrevention:
     """Cross-platform sleep prevention utility"""
     
+    # macOS IOKit power management constants
+    _IOKIT_PATH = '/System/Library/Frameworks/IOKit.framework/IOKit'
+    _CF_PATH = '/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation'
+    _CF_STRING_ENCODING_UTF8 = 0x08000100
+    _IOPM_ASSERTION_LEVEL_ON = 255
+    
+    # Windows SetThreadExecutionState flags
+    _ES_CONTINUOUS = 0x80000000
+    _ES_SYSTEM_REQUIRED = 0x00000001
+    _ES_DISPLAY_REQUIRED = 0x00000002
+    
     def __init__(self):
         self.active = False
-        self.thread = None
         self.system = platform.system().lower()
+        self._assertion = None  # macOS IOPMAssertionID
+        self._proc = None  # Long-lived inhibitor process
+        
+    def start(self) -> bool:
+        """Start sleep prevention (one assertion held until stop); returns whether it is held"""
+        if self.active:
+            return True
+            
+        try:
+            if self.system == 'darwin':  # macOS
+                self._start_macos()
+            elif self.system == 'windows':
+                # Stays in effect while the calling thread lives, so call
+                # start/stop from the application's main thread
+                import ctypes
+                ctypes.windll.kernel32.SetThreadExecutionState(
+                    self._ES_CONTINUOUS | self._ES_SYSTEM_REQUIRED | self._ES_DISPLAY_REQUIRED)
+            elif self.system == 'linux':
+                # The inhibitor lock is held for as long as systemd-inhibit runs; the
+                # inhibited command exits with this process so the lock cannot outlive it
+                self._proc = subprocess.Popen(
+                    ['systemd-inhibit', '--what=idle:sleep', '--who=motion-detector',
+                     '--why=Monitoring', 'tail', f'--pid={os.getpid()}', '-f', '/dev/null'],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    start_new_session=True)
+                try:
+                    returncode = self._proc.wait(timeout=0.2)
+                except subprocess.TimeoutExpired:
+                    pass
+                else:
+                    self._proc = None
+                    logger.warning(f"Sleep prevention error: systemd-inhibit exited with {returncode}")
+                    return False
+            else:
+                logger.warning(f"Sleep prevention not supported on {self.system}")
+                return False
+        except Exception as e:
+            logger.warning(f"Sleep prevention error: {e}")
+            return False
+        
+        self.active = True
+        logger.info("Sleep prevention started")
+        return True
+        
+    def stop(self):
+        """Stop sleep prevention"""
+        if not self.active:
+            return
+        
+        try:
+            if self._assertion is not None:
+                import ctypes
+                ctypes.CDLL(self._IOKIT_PATH).IOPMAssertionRelease(self._assertion)
+                self._assertion = None
+            elif self.system == 'windows':
+                import ctypes
+                ctypes.windll.kernel32.SetThreadExecutionState(self._ES_CONTINUOUS)
+            
+            if self._proc is not None:
+                if self.system == 'linux':
+                    # Stop systemd-inhibit together with the tail it is running
+                    os.killpg(self._proc.pid, signal.SIGTERM)
+                else:
+                    self._proc.terminate()
+                self._proc.wait(timeout=1)
+                self._proc = None
+        except Exception as e:
+            logger.debug(f"Sleep prevention release failed: {e}")
+        
+        self.active = False
+        logger.info("Sleep prevention stopped")
+        
+    def _start_macos(self):
+        """Hold an IOKit display-sleep assertion, falling back to caffeinate"""
+        try:
+            import ctypes
+            iokit = ctypes.CDLL(self._IOKIT_PATH)
+            cf = ctypes.CDLL(self._CF_PATH)
+            cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+            cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+            cf.CFRelease.argtypes = [ctypes.c_void_p]
+            iokit.IOPMAssertionCreateWithName.argtypes = [
+                ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32)]
+            iokit.IOPMAssertionRelease.argtypes = [ctypes.c_uint32]
+            
+            assertion_type = cf.CFStringCreateWithCString(
+                None, b'PreventUserIdleDisplaySleep', self._CF_STRING_ENCODING_UTF8)
+            reason = cf.CFStringCreateWithCString(
+                None, b'motion-detector: Monitoring', self._CF_STRING_ENCODING_UTF8)
+            assertion_id = ctypes.c_uint32(0)
+            result = iokit.IOPMAssertionCreateWithName(
+                assertion_type, self._IOPM_ASSERTION_LEVEL_ON, reason, ctypes.byref(assertion_id))
+            cf.CFRelease(assertion_type)
+            cf.CFRelease(reason)
+            
+            if result == 0:  # kIOReturnSuccess
+                self._assertion = assertion_id.value
+                return
+            logger.debug(f"IOPMAssertionCreateWithName failed: {result}")
+        except (OSError, AttributeError) as e:
+            logger.debug(f"IOKit unavailable: {e}")
+        
+        # caffeinate exits on its own if this process dies (-w)
+        self._proc = subprocess.Popen(
+            ['caffeinate', '-di', '-w', str(os.getpid())],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+class FrameGrabber:
+    """Reads a capture on a background thread, keeping only the newest frame
+    
+    Frames are decoded into pooled buffers. Callers hand a frame back with
+    release() once nothing references it any more; frames that are never
+    released are simply garbage collected and the pool allocates a new one.
+    """
+    
+    def __init__(self, cap: cv2.VideoCapture):
+        self.cap = cap
+        self.active = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._latest = None
+        self._free_buffers = deque()
+        
+        # A video file decodes as fast as the CPU allows, so play it back at its own frame
+        # rate; live cameras (no frame count) already deliver frames in real time
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        is_file = cap.get(cv2.CAP_PROP_FRAME_COUNT) > 0
+        self._frame_interval = (1.0 / (fps if fps > 0 else 30.0)) if is_file else 0.0
         
     def start(self):
-        """Start sleep prevention"""
+        """Start grabbing frames"""
         if self.active:
             return
             
         self.active = True
-        self.thread = threading.Thread(target=self._prevent_sleep_loop, daemon=True)
+        self.thread = threading.Thread(target=self._grab_loop, daemon=True)
         self.thread.start()
-        logger.info("Sleep prevention started")
         
     def stop(self):
-        """Stop sleep prevention"""
+        """Stop grabbing frames"""
         self.active = False
+        self._new_frame.set()  # Wake a blocked read()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=1)
-        logger.info("Sleep prevention stopped")
         
-    def _prevent_sleep_loop(self):
-        """Main sleep prevention loop"""
+    def _grab_loop(self):
+        """Grab continuously so the camera never serves stale buffered frames"""
+        next_frame_time = time.monotonic()
         while self.active:
-            try:
-                self._keep_awake()
-                time.sleep(30)  # Keep awake every 30 seconds
-            except Exception as e:
-                logger.warning(f"Sleep prevention error: {e}")
-                time.sleep(5)
-                
-    def _keep_awake(self):
-        """Platform-specific keep awake implementation"""
-        try:
-            if self.system == 'darwin':  # macOS
-                # Use caffeinate to prevent sleep
-                subprocess.run(['caffeinate', '-u', '-t', '1'], 
-                             capture_output=True, timeout=5)
-            elif self.system == 'windows':
-                # Use powercfg or SetThreadExecutionState via ctypes
-                import ctypes
-                ES_CONTINUOUS = 0x80000000
-                ES_SYSTEM_REQUIRED = 0x00000001
-                ES_DISPLAY_REQUIRED = 0x00000002
-                ctypes.windll.kernel32.SetThreadExecutionState(
-                    ES_CONTINUOUS | ES_SYSTEM_REQUIRED | ES_DISPLAY_REQUIRED)
-            elif self.system == 'linux':
-                # Try different Linux methods
-                try:
-                    # Try systemd-inhibit
-                    subprocess.run(['systemd-inhibit', '--what=idle:sleep', 
-                                  '--who=motion-detector', '--why=Monitoring', 
-                                  'sleep', '1'], capture_output=True, timeout=5)
-                except:
-                    # Fallback to xset for X11 systems
-                    try:
-                        subprocess.run(['xset', 's', 'reset'], 
-                                     capture_output=True, timeout=5)
-                    except:
-                        # Fallback to creating activity
-                        pass
-        except Exception as e:
-            logger.debug(f"Keep awake method failed: {e}")
+            if self._frame_interval:
+                # Pace file playback against a deadline, as the camera loop does
+                delay = next_frame_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                    next_frame_time += self._frame_interval
+                else:
+                    next_frame_time = time.monotonic() + self._frame_interval
+            
+            if not self.cap.grab():
+                break
+            # Decode in place into a recycled buffer (OpenCV allocates when none is free)
+            buffer = self._free_buffers.pop() if self._free_buffers else None
+            ret, frame = self.cap.retrieve(buffer)
+            if not ret:
+                break
+            
+            # Overwrite the single slot; a frame nobody read in time is dropped and recycled
+            with self._lock:
+                stale, self._latest = self._latest, frame
+            self._new_frame.set()
+            if stale is not None:
+                self._free_buffers.append(stale)
+        
+        self.active = False
+        self._new_frame.set()
+        
+    def read(self, timeout: float = 1.0):
+        """Wait for a frame newer than the last one returned (None on timeout or once the capture ends)"""
+        if not self._new_frame.wait(timeout):
+            return None
+        
+        with self._lock:
+            frame, self._latest = self._latest, None
+            if self.active:
+                self._new_frame.clear()
+        return frame
+        
+    def release(self, frame: np.ndarray):
+        """Return a frame from read() to the pool; the caller must not use it afterwards"""
+        if frame is not None:
+            self._free_buffers.append(frame)
 
 class MotionDetector:
     """Clean motion detection system with rain filtering"""
@@ -122,42 +277,238 @@ class MotionDetector:
         # Initialize sleep prevention
         self.sleep_prevention = SleepPrevention() if self.config.prevent_sleep else None
         
-        # Initialize background subtractor
-        self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows=self.config.bg_detect_shadows,
-            history=self.config.bg_history,
-            varThreshold=self.config.bg_var_threshold
-        )
+        # Blur and morphology kernels shrink with the analysis resolution
+        ksize = max(3, int(round(5 * self.config.detect_scale)) | 1)
+        self._kernel_size = (ksize, ksize)
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, self._kernel_size)
+        self._kernel_area = cv2.countNonZero(self._kernel)
+        
+        # SIMD level of the OpenCV build decides blur/morphology throughput
+        self._log_cpu_features()
+        
+        # Initialize background subtractor (GPU when available)
+        self.cuda_enabled = self.config.use_cuda and self._init_cuda_pipeline()
+        self.opencl_enabled = (not self.cuda_enabled and self.config.use_opencl
+                               and cv2.ocl.haveOpenCL())
+        if self.opencl_enabled:
+            cv2.ocl.setUseOpenCL(True)
+            logger.info("Using OpenCL background subtraction")
+        if not self.cuda_enabled:
+            self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
+                detectShadows=self.config.bg_detect_shadows,
+                history=self.config.bg_history,
+                varThreshold=self.config.bg_var_threshold
+            )
         
-        # ROI management
-        self.rois = []
-        self.motion_history = {}
+        # ROI management (structure of arrays, one row per ROI). HTTP handlers edit ROIs
+        # while the camera thread detects, so every access to the arrays holds _roi_lock
+        self._roi_lock = threading.RLock()
+        self._roi_ids = np.empty(0, dtype=np.int32)
+        self._roi_coords = np.empty((0, 4), dtype=np.int32)
+        self._roi_motion = np.zeros(0, dtype=bool)
+        self._roi_last_motion = np.empty(0, dtype=np.float64)  # NaN when never triggered
+        self._roi_history = np.zeros(0, dtype=np.uint8)  # Bit i set = motion i frames ago
+        self._roi_samples = np.zeros(0, dtype=np.uint8)  # Frames recorded, capped at the window
+        self.roi_revision = 0  # Bumped whenever anything exposed by rois changes
+        self._motion_ids_buf = np.empty(self.config.max_rois, dtype=np.int32)
+        
+        # Reusable frame buffers, sized by configure_frame_shape or on the first frame
+        self._frame_shape = None
+        self._frame_is_color = True
+        self._roi_layout = None  # (mask coords, union bbox); rebuilt when ROIs or shape change
+        self._gray_buf = None
+        self._small_buf = None
+        self._blur_buf = None
+        self._fg_buf = None
+        self._morph_buf = None
+        self._ocl_blur_buf = None
+        self._ocl_fg_buf = None
         
         # Detection state
         self.rain_detection_active = False
         self.last_notification_time = 0
+        self.frame_stride = 1  # Analyse every Nth frame; grows while ROIs stay quiet
         
         # Auto-load ROIs
         self.load_rois()
     
-    def add_roi(self, x1: int, y1: int, x2: int, y2: int) -> bool:
-        """Add a new ROI"""
+    @staticmethod
+    def _log_cpu_features():
+        """Log the CPU baseline and dispatched SIMD targets OpenCV was built with"""
+        for line in cv2.getBuildInformation().splitlines():
+            line = line.strip()
+            if line.startswith(('Baseline:', 'Dispatched code generation:')):
+                logger.info(f"OpenCV CPU {' '.join(line.split())}")
+        if not cv2.useOptimized():
+            logger.warning("OpenCV optimized code paths are disabled")
+    
+    def _init_cuda_pipeline(self) -> bool:
+        """Set up CUDA blur, background subtraction and morphology if a GPU is present"""
         try:
-            if len(self.rois) >= self.config.max_rois:
-                logger.warning(f"Maximum ROIs ({self.config.max_rois}) reached")
+            if cv2.cuda.getCudaEnabledDeviceCount() == 0:
                 return False
             
-            # Generate unique ID
-            roi_id = max([roi['id'] for roi in self.rois], default=0) + 1
-            
-            roi = {
-                'id': roi_id,
-                'coords': [int(x1), int(y1), int(x2), int(y2)],
-                'motion_detected': False,
-                'last_motion_time': None
-            }
+            self._cuda_stream = cv2.cuda.Stream()
+            self._cuda_frame = cv2.cuda.GpuMat()
+            self._cuda_blur = cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, self._kernel_size, 0)
+            self._cuda_close = cv2.cuda.createMorphologyFilter(cv2.MORPH_CLOSE, cv2.CV_8UC1, self._kernel)
+            self._cuda_open = cv2.cuda.createMorphologyFilter(cv2.MORPH_OPEN, cv2.CV_8UC1, self._kernel)
+            self.background_subtractor = cv2.cuda.createBackgroundSubtractorMOG2(
+                history=self.config.bg_history,
+                varThreshold=self.config.bg_var_threshold,
+                detectShadows=self.config.bg_detect_shadows
+            )
+            logger.info("Using CUDA background subtraction")
+            return True
             
-            self.rois.append(roi)
+        except (AttributeError, cv2.error) as e:
+            logger.debug(f"CUDA background subtraction unavailable: {e}")
+            return False
+    
+    def _mask_is_negligible(self, fg_pixels: int) -> bool:
+        """Check whether a raw MOG2 mask is too sparse to produce motion or rain"""
+        # Closing grows each foreground pixel by at most the kernel area, so below
+        # this bound no contour can reach min_contour_area and the rain count cannot
+        # exceed max_small_contours; morphology and contours can be skipped
+        min_contour_area = self.config.min_contour_area * self.config.detect_scale ** 2
+        return (fg_pixels * self._kernel_area < min_contour_area and
+                fg_pixels <= self.config.max_small_contours)
+    
+    # The foreground backends run background subtraction on the whole frame (so the
+    # model stays stable) but morphology only inside bbox = (x1, y1, x2, y2), and
+    # return the mask cropped to bbox, or None when it cannot contain motion or rain
+    
+    def _foreground_mask_cuda(self, gray_frame: np.ndarray, bbox: tuple):
+        """Run blur, background subtraction and morphology on the GPU"""
+        stream = self._cuda_stream
+        self._cuda_frame.upload(gray_frame, stream)
+        
+        blurred = self._cuda_blur.apply(self._cuda_frame, stream=stream)
+        fg_mask = self.background_subtractor.apply(blurred, -1, stream)
+        
+        x1, y1, x2, y2 = bbox
+        fg_mask = cv2.cuda_GpuMat(fg_mask, (x1, y1, x2 - x1, y2 - y1))
+        stream.waitForCompletion()
+        if self._mask_is_negligible(cv2.cuda.countNonZero(fg_mask)):
+            return None
+        
+        fg_mask = self._cuda_close.apply(fg_mask, stream=stream)
+        fg_mask = self._cuda_open.apply(fg_mask, stream=stream)
+        
+        # Contour analysis runs on the CPU, so bring the cropped mask back once
+        result = fg_mask.download(stream)
+        stream.waitForCompletion()
+        return result
+    
+    def _foreground_mask_opencl(self, gray_frame: np.ndarray, bbox: tuple):
+        """Run blur, background subtraction and morphology through the OpenCL T-API"""
+        ugray = cv2.GaussianBlur(cv2.UMat(gray_frame), self._kernel_size, 0, dst=self._ocl_blur_buf)
+        
+        # Apply background subtraction
+        fg_mask = self.background_subtractor.apply(ugray, fgmask=self._ocl_fg_buf)
+        
+        x1, y1, x2, y2 = bbox
+        fg_mask = cv2.UMat(fg_mask, (y1, y2), (x1, x2))
+        if self._mask_is_negligible(cv2.countNonZero(fg_mask)):
+            return None
+        
+        # Enhanced morphological operations for rain filtering
+        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self._kernel)
+        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self._kernel)
+        
+        # Contour analysis runs on host memory, so map the cropped mask back once
+        return fg_mask.get()
+    
+    def _foreground_mask_cpu(self, gray_frame: np.ndarray, bbox: tuple):
+        """Run blur, background subtraction and morphology on the CPU"""
+        blurred = cv2.GaussianBlur(gray_frame, self._kernel_size, 0, dst=self._blur_buf)
+        
+        # Apply background subtraction
+        fg_mask = self.background_subtractor.apply(blurred, fgmask=self._fg_buf)
+        
+        x1, y1, x2, y2 = bbox
+        fg_mask = fg_mask[y1:y2, x1:x2]
+        if self._mask_is_negligible(cv2.countNonZero(fg_mask)):
+            return None
+        
+        # Enhanced morphological operations for rain filtering (ping-pong between buffers)
+        morph_buf = self._morph_buf[y1:y2, x1:x2]
+        cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self._kernel, dst=morph_buf)
+        return cv2.morphologyEx(morph_buf, cv2.MORPH_OPEN, self._kernel, dst=fg_mask)
+    
+    @property
+    def rois(self) -> list:
+        """ROIs as a list of dicts (id, coords, motion_detected, last_motion_time)"""
+        with self._roi_lock:
+            return [
+                {
+                    'id': int(roi_id),
+                    'coords': coords.tolist(),
+                    'motion_detected': bool(motion),
+                    'last_motion_time': None if np.isnan(last_motion) else float(last_motion)
+                }
+                for roi_id, coords, motion, last_motion in zip(
+                    self._roi_ids, self._roi_coords, self._roi_motion, self._roi_last_motion)
+            ]
+    
+    @property
+    def roi_count(self) -> int:
+        """Number of configured ROIs"""
+        with self._roi_lock:
+            return len(self._roi_ids)
+    
+    @property
+    def motion_roi_ids(self) -> list:
+        """IDs of ROIs currently reporting motion"""
+        with self._roi_lock:
+            if len(self._motion_ids_buf) < len(self._roi_ids):
+                self._motion_ids_buf = np.empty(len(self._roi_ids), dtype=np.int32)
+            count = collect_motion_ids(self._roi_ids, self._roi_motion, self._motion_ids_buf)
+            return self._motion_ids_buf[:count].tolist()
+    
+    @property
+    def motion_active(self) -> bool:
+        """Whether any ROI currently reports motion"""
+        with self._roi_lock:
+            return bool(self._roi_motion.any())
+    
+    def _set_rois(self, rois: list):
+        """Replace all ROIs from a list of dicts"""
+        ids = np.array([roi['id'] for roi in rois], dtype=np.int32)
+        coords = np.array([roi['coords'] for roi in rois], dtype=np.int32).reshape(-1, 4)
+        motion = np.array([roi.get('motion_detected', False) for roi in rois], dtype=bool)
+        last_motion = np.array(
+            [roi.get('last_motion_time') or np.nan for roi in rois], dtype=np.float64)
+        
+        with self._roi_lock:
+            self._roi_ids = ids
+            self._roi_coords = coords
+            self._roi_motion = motion
+            self._roi_last_motion = last_motion
+            self._roi_history = np.zeros(len(rois), dtype=np.uint8)
+            self._roi_samples = np.zeros(len(rois), dtype=np.uint8)
+            self._roi_layout = None
+            self.roi_revision += 1
+    
+    def add_roi(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        """Add a new ROI"""
+        try:
+            with self._roi_lock:
+                if len(self._roi_ids) >= self.config.max_rois:
+                    logger.warning(f"Maximum ROIs ({self.config.max_rois}) reached")
+                    return False
+                
+                # Generate unique ID
+                roi_id = int(self._roi_ids.max(initial=0)) + 1
+                
+                self._roi_ids = np.append(self._roi_ids, np.int32(roi_id))
+                self._roi_coords = np.vstack([self._roi_coords, np.array([[x1, y1, x2, y2]], dtype=np.int32)])
+                self._roi_motion = np.append(self._roi_motion, False)
+                self._roi_last_motion = np.append(self._roi_last_motion, np.nan)
+                self._roi_history = np.append(self._roi_history, np.uint8(0))
+                self._roi_samples = np.append(self._roi_samples, np.uint8(0))
+                self._roi_layout = None
+                self.roi_revision += 1
             logger.info(f"Added ROI {roi_id}: ({x1},{y1}) to ({x2},{y2})")
             return True
             
@@ -168,22 +519,28 @@ class MotionDetector:
     def delete_roi(self, roi_id: int) -> bool:
         """Delete ROI by ID"""
         try:
-            for i, roi in enumerate(self.rois):
-                if roi['id'] == roi_id:
-                    del self.rois[i]
-                    # Clean up motion history
-                    self.motion_history.pop(roi_id, None)
-                    logger.info(f"Deleted ROI {roi_id}")
-                    return True
-            return False
+            with self._roi_lock:
+                index = np.flatnonzero(self._roi_ids == roi_id)
+                if not index.size:
+                    return False
+                
+                self._roi_ids = np.delete(self._roi_ids, index)
+                self._roi_coords = np.delete(self._roi_coords, index, axis=0)
+                self._roi_motion = np.delete(self._roi_motion, index)
+                self._roi_last_motion = np.delete(self._roi_last_motion, index)
+                self._roi_history = np.delete(self._roi_history, index)
+                self._roi_samples = np.delete(self._roi_samples, index)
+                self._roi_layout = None
+                self.roi_revision += 1
+            logger.info(f"Deleted ROI {roi_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to delete ROI {roi_id}: {e}")
             return False
     
     def clear_rois(self):
         """Clear all ROIs"""
-        self.rois.clear()
-        self.motion_history.clear()
+        self._set_rois([])
         logger.info("All ROIs cleared")
     
     def save_rois(self, filename: str = None) -> bool:
@@ -192,8 +549,18 @@ class MotionDetector:
             filename = filename or self.config.roi_config_file
             Path(filename).parent.mkdir(parents=True, exist_ok=True)
             
-            with open(filename, 'w') as f:
-                json.dump(self.rois, f, indent=2)
+            # Write a uniquely named sibling temp file, flush it to disk and swap it in, so
+            # overlapping saves never share a file and a crash never leaves a truncated config
+            tmp_file = tempfile.NamedTemporaryFile('w', dir=Path(filename).parent, suffix='.tmp', delete=False)
+            try:
+                with tmp_file:
+                    json.dump(self.rois, tmp_file, indent=2)
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+                os.replace(tmp_file.name, filename)
+            except Exception:
+                os.unlink(tmp_file.name)
+                raise
             
             logger.info(f"ROIs saved to {filename}")
             return True
@@ -212,94 +579,189 @@ class MotionDetector:
                 return False
             
             with open(filename, 'r') as f:
-                self.rois = json.load(f)
+                self._set_rois(json.load(f))
             
-            logger.info(f"Loaded {len(self.rois)} ROIs from {filename}")
+            logger.info(f"Loaded {self.roi_count} ROIs from {filename}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to load ROIs: {e}")
             return False
     
-    def detect_motion_in_rois(self, frame: np.ndarray) -> bool:
-        """Detect motion in configured ROIs with rain filtering"""
-        if not self.rois:
-            return False
+    def configure_frame_shape(self, height: int, width: int, channels: int = 3):
+        """Preallocate buffers and ROI geometry for the camera's frame size"""
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        with self._roi_lock:
+            self._ensure_buffers(shape)
+            if len(self._roi_ids):
+                self._get_roi_layout()
+    
+    def _ensure_buffers(self, shape: tuple):
+        """(Re)allocate the per-frame working buffers for a frame shape"""
+        if self._frame_shape == shape:
+            return
         
-        # Convert to grayscale
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
-        gray_frame = cv2.GaussianBlur(gray_frame, (5, 5), 0)
+        self._frame_shape = shape
+        self._frame_is_color = len(shape) == 3
+        self._roi_layout = None
+        height, width = shape[:2]
         
-        # Apply background subtraction
-        fg_mask = self.background_subtractor.apply(gray_frame)
+        scale = self.config.detect_scale
+        if scale != 1.0:
+            analysis_shape = (int(round(height * scale)), int(round(width * scale)))
+            self._small_buf = np.empty(analysis_shape + shape[2:], dtype=np.uint8)
+        else:
+            analysis_shape = (height, width)
+            self._small_buf = None
         
-        # Enhanced morphological operations for rain filtering
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
+        self._gray_buf = np.empty(analysis_shape, dtype=np.uint8)
+        self._blur_buf = np.empty(analysis_shape, dtype=np.uint8)
+        self._fg_buf = np.empty(analysis_shape, dtype=np.uint8)
+        self._morph_buf = np.empty(analysis_shape, dtype=np.uint8)
+        
+        # Device-side equivalents keep the OpenCL intermediates resident between frames
+        if self.opencl_enabled:
+            self._ocl_blur_buf = cv2.UMat(*analysis_shape, cv2.CV_8UC1)
+            self._ocl_fg_buf = cv2.UMat(*analysis_shape, cv2.CV_8UC1)
+    
+    def _get_roi_layout(self) -> tuple:
+        """ROI coords in mask space and their union bbox, cached until ROIs or frame shape change
         
-        # Detect rain pattern (many small contours)
-        temp_contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        small_contours = [c for c in temp_contours if cv2.contourArea(c) < self.config.min_contour_area]
+        Call with _roi_lock held.
+        """
+        if self._roi_layout is not None:
+            return self._roi_layout
         
-        # Update rain detection status
-        self.rain_detection_active = len(small_contours) > self.config.max_small_contours
+        # Map every ROI into the mask
+        height, width = self._gray_buf.shape
+        coords = (self._roi_coords * self.config.detect_scale).astype(np.int32)
+        np.clip(coords[:, 0::2], 0, width, out=coords[:, 0::2])
+        np.clip(coords[:, 1::2], 0, height, out=coords[:, 1::2])
         
-        motion_detected_any = False
+        # Union of all ROIs plus a margin that keeps morphology exact at ROI edges
+        margin = 2 * self._kernel_size[0]
+        bx1 = max(int(coords[:, 0::2].min()) - margin, 0)
+        by1 = max(int(coords[:, 1::2].min()) - margin, 0)
+        bx2 = min(int(coords[:, 0::2].max()) + margin, width)
+        by2 = min(int(coords[:, 1::2].max()) + margin, height)
+        coords -= np.array([bx1, by1, bx1, by1], dtype=np.int32)
         
-        # Check motion in each ROI
-        for roi in self.rois:
-            roi_id = roi['id']
-            x1, y1, x2, y2 = roi['coords']
+        self._roi_layout = (coords, (bx1, by1, bx2, by2))
+        return self._roi_layout
+    
+    def detect_motion_in_rois(self, frame: np.ndarray) -> bool:
+        """Detect motion in configured ROIs with rain filtering"""
+        # Snapshot the ROI geometry once; ROIs edited while this frame is analysed
+        # invalidate the result instead of mixing arrays of different lengths
+        with self._roi_lock:
+            if not len(self._roi_ids):
+                return False
             
-            # Initialize motion history
-            if roi_id not in self.motion_history:
-                self.motion_history[roi_id] = []
+            self._ensure_buffers(frame.shape)
+            coords, bbox = self._get_roi_layout()
+            revision = self.roi_revision
+        
+        # Downscale once, before colour conversion; ROI coords and area thresholds are scaled to match
+        scale = self.config.detect_scale
+        if self._small_buf is not None:
+            frame = cv2.resize(frame, self._small_buf.shape[1::-1], dst=self._small_buf,
+                               interpolation=cv2.INTER_AREA)
+        
+        # Convert to grayscale
+        if self._frame_is_color:
+            gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        else:
+            gray_frame = frame
+        
+        area_scale = scale * scale
+        min_contour_area = self.config.min_contour_area * area_scale
+        
+        # Foreground mask with rain-filtering morphology, cropped to the ROI union
+        if self.cuda_enabled:
+            fg_mask = self._foreground_mask_cuda(gray_frame, bbox)
+        elif self.opencl_enabled:
+            fg_mask = self._foreground_mask_opencl(gray_frame, bbox)
+        else:
+            fg_mask = self._foreground_mask_cpu(gray_frame, bbox)
+        
+        # After morphology a mask with fewer pixels than min_contour_area holds no
+        # significant blob, and at most one small blob per pixel; skip labelling it
+        if fg_mask is not None:
+            fg_pixels = cv2.countNonZero(fg_mask)
+            if fg_pixels < min_contour_area and fg_pixels <= self.config.max_small_contours:
+                fg_mask = None
+        
+        if fg_mask is None:
+            # Too sparse for motion or rain: every ROI records an empty frame
+            self.rain_detection_active = False
+            total_areas = np.zeros(len(coords))
+        else:
+            # Label foreground blobs once; blob areas come back as an array, ids as an image
+            num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(fg_mask, connectivity=8)
+            areas = stats[1:, cv2.CC_STAT_AREA]  # Skip the background label
             
-            # Extract ROI from mask
-            roi_mask = fg_mask[y1:y2, x1:x2]
-            contours, _ = cv2.findContours(roi_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Detect rain pattern (many small blobs)
+            self.rain_detection_active = bool(
+                np.count_nonzero(areas < min_contour_area) > self.config.max_small_contours)
             
-            # Filter significant contours
-            large_contours = [c for c in contours if cv2.contourArea(c) >= self.config.min_contour_area]
-            total_area = sum(cv2.contourArea(contour) for contour in large_contours)
+            # Per ROI, sum the blob area inside it, counting a blob only when its part
+            # inside the ROI reaches min_contour_area
+            total_areas = roi_total_area(labels, num_labels, coords, min_contour_area) / area_scale
+        
+        with self._roi_lock:
+            if self.roi_revision != revision:
+                # ROIs changed mid-frame: drop this result and analyse the next frame
+                self.frame_stride = 1
+                return False
             
-            # Add to motion history
-            self.motion_history[roi_id].append(total_area > self.config.motion_threshold)
-            if len(self.motion_history[roi_id]) > self.config.motion_smoothing_frames:
-                self.motion_history[roi_id].pop(0)
+            # Shift this frame into every ROI's motion history bitmask
+            window = min(self.config.motion_smoothing_frames, 8)
+            hits = total_areas > self.config.motion_threshold
+            self._roi_history = ((self._roi_history << 1) | hits) & ((1 << window) - 1)
+            self._roi_samples = np.minimum(self._roi_samples + 1, window).astype(np.uint8)
             
-            # Require consistent motion over multiple frames
-            consistent_motion = (
-                len(self.motion_history[roi_id]) >= self.config.motion_smoothing_frames and
-                sum(self.motion_history[roi_id]) >= 2  # At least 2 out of 3 frames
-            )
+            # Require consistent motion over multiple frames (at least 2 out of 3 frames)
+            consistent_motion = (self._roi_samples >= window) & (_POPCOUNT[self._roi_history] >= 2)
             
             # Final motion decision (filtered during rain)
-            motion_detected = consistent_motion and not self.rain_detection_active
-            roi['motion_detected'] = motion_detected
+            motion_before = self._roi_motion.any()
+            self._roi_motion = consistent_motion & (not self.rain_detection_active)
+            motion_indices = np.flatnonzero(self._roi_motion)
+            if motion_before or motion_indices.size:
+                self.roi_revision += 1  # Motion flags or last-motion times changed
             
-            if motion_detected:
-                motion_detected_any = True
-                roi['last_motion_time'] = time.time()
-                
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                rain_status = "(Rain filtered)" if self.rain_detection_active else ""
-                logger.info(f"[{timestamp}] Motion in ROI {roi_id} - Area: {total_area} {rain_status}")
+            if motion_indices.size:
+                # One clock read and one strftime per frame, shared by every triggered ROI
+                now = time.time()
+                self._roi_last_motion[motion_indices] = now
+                motion_ids = self._roi_ids[motion_indices]
+            
+            # Back off while every ROI is quiet; analyse every frame as soon as one is not
+            if self._roi_history.any():
+                self.frame_stride = 1
+            else:
+                self.frame_stride = min(self.frame_stride + 1, self.config.max_frame_skip)
+        
+        if motion_indices.size:
+            timestamp = datetime.fromtimestamp(now).strftime("%H:%M:%S")
+            rain_status = "(Rain filtered)" if self.rain_detection_active else ""
+            for roi_id, i in zip(motion_ids, motion_indices):
+                logger.info(f"[{timestamp}] Motion in ROI {roi_id} - Area: {total_areas[i]} {rain_status}")
         
-        return motion_detected_any
+        return bool(motion_indices.size)
     
     def process_frame(self, frame: np.ndarray) -> dict:
         """Process frame for motion detection"""
+        with self._roi_lock:
+            active_rois = int(np.count_nonzero(self._roi_motion))
         results = {
             'motion_detected': False,
             'rain_active': self.rain_detection_active,
-            'active_rois': len([roi for roi in self.rois if roi.get('motion_detected', False)])
+            'active_rois': active_rois
         }
         
-        # Motion detection
-        if self.rois:
-            results['motion_detected'] = self.detect_motion_in_rois(frame)
+        # Motion detection (returns False straight away when there are no ROIs)
+        results['motion_detected'] = self.detect_motion_in_rois(frame)
         
         return results
     
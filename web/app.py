@@ -4,34 +4,51 @@ Web Interface for Person Detection System
 Clean Flask application with WebSocket support
 """
 
+import atexit
+import importlib.util
 import json
+import queue
 import threading
 import time
-import base64
 from datetime import datetime
 from pathlib import Path
 import os
 
 import cv2
 import numpy as np
-from flask import Flask, render_template, request, jsonify
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, request, jsonify
+from flask_socketio import SocketIO, emit, join_room
 import logging
+import logging.handlers
 from dotenv import load_dotenv
 
+# Optional SIMD JPEG encoder (libjpeg-turbo); falls back to cv2.imencode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# Optional C JSON serializer for REST responses and Socket.IO packets; falls back to json
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
 # Import our clean detector
 import sys
-import os
-from pathlib import Path
 
 # Add parent directory to path to access src module
 parent_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(parent_dir))
+if str(parent_dir) not in sys.path:  # Already there when launched via main.py
+    sys.path.insert(0, str(parent_dir))
 
-from src.detector import MotionDetector, DetectorConfig
+from src.detector import MotionDetector, DetectorConfig, FrameGrabber
 
 # Web app configuration from environment variables
 WEB_HOST = os.getenv('WEB_HOST', '0.0.0.0')
@@ -40,10 +57,34 @@ DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'detector_web_secret_2025')
 CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
 DEFAULT_CAMERA_SOURCE = int(os.getenv('DEFAULT_CAMERA_SOURCE', 0))
-
-# Setup logging
+FRAME_INTERVAL = 1.0 / 30.0  # Camera loop pacing (seconds per frame)
+PREVIEW_SCALE = float(os.getenv('PREVIEW_SCALE', 0.5))  # Live preview size relative to the camera frame
+EMIT_INTERVAL = 1.0 / float(os.getenv('EMIT_FPS', 10))  # Live preview rate, independent of detection
+PREVIEW_IDLE_INTERVAL = 1.0  # Resend an unchanged preview at least this often (seconds)
+PREVIEW_STATIC_THRESHOLD = 0.5  # Mean gray-level change of the 32x32 thumbnail below which a frame is unchanged
+VIDEO_ROOM = 'video'  # Socket.IO room that receives frame_update
+
+# cv2.imencode settings for the preview when libjpeg-turbo is unavailable: baseline
+# (non-progressive) JPEG without the extra Huffman optimization pass, 4:2:0 chroma
+JPEG_ENCODE_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, 85,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+    cv2.IMWRITE_JPEG_CHROMA_QUALITY, 70,
+    cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+]
+
+# Setup logging: QueueHandler formats each record on the calling thread, but the
+# stream write happens on the listener's background thread, off the detection loop
 log_level = getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper())
-logging.basicConfig(level=log_level)
+log_queue = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler)
+logging.root.setLevel(log_level)
+logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on shutdown
 logger = logging.getLogger(__name__)
 
 # Check if we're in production mode (static files present)
@@ -56,7 +97,40 @@ app = Flask(__name__,
            static_folder=static_folder,
            static_url_path=static_url_path)
 app.config['SECRET_KEY'] = FLASK_SECRET_KEY
-socketio = SocketIO(app, cors_allowed_origins=CORS_ORIGINS, async_mode='threading')
+
+if ORJSON_AVAILABLE:
+    class ORJSONProvider(JSONProvider):
+        """Flask JSON provider backed by orjson"""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    class ORJSONSocketIO:
+        """json-module stand-in for Socket.IO packets (ignores json.dumps keyword options)"""
+        
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = ORJSONProvider(app)
+    socketio_json = ORJSONSocketIO
+else:
+    socketio_json = json
+# Threading mode keeps OpenCV's blocking calls on real OS threads; simple-websocket
+# gives it a native WebSocket transport instead of HTTP long-polling
+# The only payloads above Engine.IO's 1 KB compression threshold are JPEG frames, which
+# do not shrink, so HTTP (polling) compression would just burn CPU on every frame
+socketio = SocketIO(app, cors_allowed_origins=CORS_ORIGINS, async_mode='threading', json=socketio_json,
+                    http_compression=False)
+if importlib.util.find_spec('simple_websocket') is None:
+    logger.warning("simple-websocket not installed; Socket.IO falls back to HTTP long-polling")
 
 logger.info(f"Starting in {'PRODUCTION' if PRODUCTION_MODE else 'DEVELOPMENT'} mode")
 
@@ -68,9 +142,28 @@ class WebDetector:
     
     def __init__(self):
         self.detector = None
+        self.camera_source = None  # Camera the current detector was initialized for
         self.camera_active = False
+        self._stop_event = None  # Per-run stop signal shared by that run's threads
         self.camera_thread = None
-        self.current_frame = None
+        self.encode_thread = None
+        self.encode_queue = queue.Queue(maxsize=1)  # Latest frame awaiting JPEG encode
+        self.sender_thread = None
+        self._frame_slot_lock = threading.Lock()
+        self._frame_slot_event = threading.Event()
+        self._pending_frame = None  # Latest encoded frame_update payload not yet sent
+        self._jpeg_ready = threading.Condition(self._frame_slot_lock)
+        self._latest_jpeg = None  # Latest preview JPEG, kept for MJPEG streaming
+        self._latest_jpeg_seq = 0
+        self.grabber = None
+        self.jpeg = self._create_jpeg_encoder()
+        self._preview_buf = None  # Downscaled preview, owned by the encode thread
+        self._last_thumbnail = None  # 32x32 gray thumbnail of the last preview sent
+        self._last_preview_time = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_frame = None  # Last full-resolution frame emitted, kept for /api/snapshot
+        self._roi_cache = []
+        self._roi_cache_key = None  # (detector, roi_revision) the cache was built from
         self.stats = {
             'fps': 0,
             'camera_status': 'disconnected',
@@ -81,11 +174,31 @@ class WebDetector:
             'motion_detected_rois': []
         }
     
+    @staticmethod
+    def _create_jpeg_encoder():
+        """Load libjpeg-turbo once; None means frames are encoded with cv2.imencode"""
+        if not TURBOJPEG_AVAILABLE:
+            return None
+        try:
+            return TurboJPEG()
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"libjpeg-turbo unavailable, using OpenCV JPEG encoder: {e}")
+            return None
+    
     def initialize(self, camera_source: int = 0) -> bool:
-        """Initialize the detection system"""
+        """Initialize the detection system (no-op if already initialized for this camera)"""
+        # Keep a running detector's learned background and caches across repeat calls
+        if self.detector is not None and camera_source == self.camera_source:
+            return True
+        
         try:
+            # A different camera needs a fresh background model
+            if self.camera_active:
+                self.stop_camera()
+            
             config = DetectorConfig()
             self.detector = MotionDetector(config)
+            self.camera_source = camera_source
             logger.info("Detector initialized successfully")
             return True
         except Exception as e:
@@ -97,14 +210,25 @@ class WebDetector:
         if self.camera_active:
             return True
         
+        # A previous run's threads must not share buffers with this one
+        self._join_threads()
+        
         try:
+            # Pipeline: FrameGrabber (capture) -> camera thread (detect) -> encode thread (JPEG)
+            # -> sender task (Socket.IO emit)
+            stop_event = threading.Event()
             self.camera_thread = threading.Thread(
                 target=self._camera_loop,
-                args=(source,),
+                args=(source, stop_event),
                 daemon=True
             )
+            self.encode_thread = threading.Thread(
+                target=self._encode_loop, args=(stop_event,), daemon=True)
+            self._stop_event = stop_event
             self.camera_active = True
             self.camera_thread.start()
+            self.encode_thread.start()
+            self.sender_thread = socketio.start_background_task(self._sender_loop, stop_event)
             logger.info("Camera feed started")
             return True
         except Exception as e:
@@ -114,36 +238,88 @@ class WebDetector:
     def stop_camera(self):
         """Stop camera feed"""
         self.camera_active = False
-        if self.camera_thread and self.camera_thread.is_alive():
-            self.camera_thread.join(timeout=2)
+        self._join_threads()
         self.stats['camera_status'] = 'disconnected'
         logger.info("Camera feed stopped")
     
-    def _camera_loop(self, source):
+    def _join_threads(self):
+        """Signal the current run's threads to stop and wait for them"""
+        if self._stop_event:
+            self._stop_event.set()
+        if self.camera_thread and self.camera_thread.is_alive():
+            self.camera_thread.join(timeout=2)
+        if self.encode_thread and self.encode_thread.is_alive():
+            self.encode_thread.join(timeout=2)
+        self._frame_slot_event.set()  # Wake the sender so it sees the stop event
+        if self.sender_thread and self.sender_thread.is_alive():
+            self.sender_thread.join(timeout=2)
+        
+        # A frame still queued for encoding belongs to this run's grabber, not the next one's
+        while True:
+            try:
+                stale = self.encode_queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.grabber:
+                self.grabber.release(stale)
+        
+        # A stopped camera has no current image; /api/snapshot answers 404 until the next run
+        with self._snapshot_lock:
+            stale, self._snapshot_frame = self._snapshot_frame, None
+        if self.grabber:
+            self.grabber.release(stale)
+        
+        # Nor a current preview: MJPEG clients and the next run's sender wait for a new frame
+        with self._frame_slot_lock:
+            self._pending_frame = None
+            self._latest_jpeg = None
+            self._frame_slot_event.clear()
+        self._last_thumbnail = None
+    
+    def _camera_loop(self, source, stop_event: threading.Event):
         """Main camera processing loop"""
         cap = cv2.VideoCapture(source)
         if not cap.isOpened():
             logger.error("Failed to open camera")
+            stop_event.set()
             self.camera_active = False
             self.stats['camera_status'] = 'disconnected'
             socketio.emit('stats_update', self.stats)
             return
         
+        # Size the detector's buffers for the resolution the camera actually delivers
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if self.detector and width and height:
+            self.detector.configure_frame_shape(height, width)
+        
+        # Capture runs on its own thread so detection always sees the newest frame
+        grabber = FrameGrabber(cap)
+        grabber.start()
+        self.grabber = grabber
+        
         self.stats['camera_status'] = 'connected'
         fps_counter = 0
-        fps_start_time = time.time()
-        last_stats_emit = time.time()
+        fps_start_time = time.monotonic()
+        last_stats_emit = time.monotonic()
+        next_frame_time = time.monotonic()
+        last_frame_emit = 0.0
+        frames_until_detect = 0
         
         try:
-            while self.camera_active:
-                ret, frame = cap.read()
-                if not ret:
+            while not stop_event.is_set():
+                frame = grabber.read()
+                if frame is None:
+                    if grabber.active:
+                        continue  # No new frame yet; re-check the stop event
                     logger.warning("Failed to read frame")
                     break
                 
-                # Process frame with detector
-                if self.detector:
+                # Process frame with detector (adaptive stride while ROIs are quiet)
+                frames_until_detect -= 1
+                if self.detector and frames_until_detect <= 0:
                     results = self.detector.process_frame(frame)
+                    frames_until_detect = self.detector.frame_stride
                     
                     # Update stats
                     motion_detected = results.get('motion_detected', False)
@@ -152,64 +328,184 @@ class WebDetector:
                         self.stats['last_detection_time'] = datetime.now().isoformat()
                     
                     self.stats['rain_detected'] = results.get('rain_active', False)
-                    self.stats['active_rois'] = len(self.detector.rois)
-                    self.stats['motion_detected_rois'] = [
-                        roi['id'] for roi in self.detector.rois 
-                        if roi.get('motion_detected', False)
-                    ]
+                    self.stats['active_rois'] = self.detector.roi_count
+                    self.stats['motion_detected_rois'] = self.detector.motion_roi_ids
                     self.stats['camera_status'] = 'connected'  # Ensure status stays connected
                 
-                # Store frame for web interface
-                self.current_frame = frame
-                
                 # Calculate FPS
                 fps_counter += 1
                 if fps_counter >= 30:
-                    elapsed = time.time() - fps_start_time
+                    elapsed = time.monotonic() - fps_start_time
                     self.stats['fps'] = fps_counter / elapsed if elapsed > 0 else 0
                     fps_counter = 0
-                    fps_start_time = time.time()
+                    fps_start_time = time.monotonic()
                 
-                # Emit frame to web clients
-                self._emit_frame()
+                # Hand the frame to the encode thread at the preview rate (it returns the frame
+                # to the grabber's pool); frames between previews are recycled right away
+                current_time = time.monotonic()
+                if current_time - last_frame_emit >= EMIT_INTERVAL:
+                    last_frame_emit = current_time
+                    grabber.release(self._put_latest(self.encode_queue, frame))
+                else:
+                    grabber.release(frame)
                 
                 # Emit stats update every 2 seconds or when motion detected
-                current_time = time.time()
+                current_time = time.monotonic()
                 if (current_time - last_stats_emit > 2.0 or 
-                    (self.detector and any(roi.get('motion_detected', False) for roi in self.detector.rois))):
+                    (self.detector and self.detector.motion_active)):
                     socketio.emit('stats_update', self.stats)
                     last_stats_emit = current_time
                 
-                time.sleep(0.03)  # ~30 FPS
+                # Pace to ~30 FPS against a deadline so processing time is not added on top
+                next_frame_time += FRAME_INTERVAL
+                delay = next_frame_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame_time = time.monotonic()  # Overran; don't try to catch up
                 
         except Exception as e:
             logger.error(f"Camera loop error: {e}")
         finally:
+            grabber.stop()
             cap.release()
-            self.camera_active = False
-            self.stats['camera_status'] = 'disconnected'
-            socketio.emit('stats_update', self.stats)
+            stop_event.set()  # Also ends this run's encode and sender threads
+            if self._stop_event is stop_event:  # Not already superseded by a new run
+                self.camera_active = False
+                self.stats['camera_status'] = 'disconnected'
+                socketio.emit('stats_update', self.stats)
     
-    def _emit_frame(self):
-        """Emit frame to web clients"""
+    @staticmethod
+    def _put_latest(frame_queue: queue.Queue, item):
+        """Put into a single-slot queue; returns the stale item it replaced, if any"""
+        stale = None
         try:
-            if self.current_frame is not None:
-                _, buffer = cv2.imencode('.jpg', self.current_frame, 
-                                       [cv2.IMWRITE_JPEG_QUALITY, 85])
-                frame_data = base64.b64encode(buffer).decode('utf-8')
+            frame_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                stale = frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            frame_queue.put_nowait(item)
+        return stale
+    
+    def _encode_loop(self, stop_event: threading.Event):
+        """Encode frames so JPEG work overlaps the next detection pass"""
+        while not stop_event.is_set():
+            try:
+                frame = self.encode_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._emit_frame(frame)
+            
+            # Keep this frame for snapshots and recycle the one it replaces
+            with self._snapshot_lock:
+                stale, self._snapshot_frame = self._snapshot_frame, frame
+            if self.grabber:
+                self.grabber.release(stale)
+    
+    def _encode_jpeg(self, frame) -> bytes:
+        """JPEG-encode a BGR frame"""
+        if self.jpeg:
+            return self.jpeg.encode(frame, quality=85,
+                                    pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+        _, buffer = cv2.imencode('.jpg', frame, JPEG_ENCODE_PARAMS)
+        return bytes(buffer)
+    
+    def _preview(self, frame):
+        """Downscale a frame to the preview size (detection keeps the full frame)"""
+        if PREVIEW_SCALE == 1.0:
+            return frame
+        
+        height, width = frame.shape[:2]
+        size = (max(1, int(round(width * PREVIEW_SCALE))), max(1, int(round(height * PREVIEW_SCALE))))
+        if self._preview_buf is None or self._preview_buf.shape[1::-1] != size:
+            self._preview_buf = np.empty(size[::-1] + frame.shape[2:], dtype=np.uint8)
+        return cv2.resize(frame, size, dst=self._preview_buf, interpolation=cv2.INTER_AREA)
+    
+    def _frame_thumbnail(self, frame):
+        """32x32 grayscale thumbnail; area averaging smooths out sensor noise"""
+        thumbnail = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+        if thumbnail.ndim == 3:
+            thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+        return thumbnail
+    
+    def _sender_loop(self, stop_event: threading.Event):
+        """Send the newest encoded frame; a slow client only causes older frames to be dropped"""
+        while not stop_event.is_set():
+            if not self._frame_slot_event.wait(timeout=0.5):
+                continue
+            with self._frame_slot_lock:
+                payload, self._pending_frame = self._pending_frame, None
+                self._frame_slot_event.clear()
+            if payload is not None:
+                socketio.emit('frame_update', payload, to=VIDEO_ROOM)
+    
+    def _emit_frame(self, frame):
+        """Encode a frame and hand it to the sender task for web clients"""
+        try:
+            if frame is not None:
+                # Skip frames that look the same as the last one sent while nothing is
+                # moving, but still send one every PREVIEW_IDLE_INTERVAL as a keepalive
+                now = time.monotonic()
+                thumbnail = self._frame_thumbnail(frame)
+                if (self._last_thumbnail is not None
+                        and cv2.norm(thumbnail, self._last_thumbnail, cv2.NORM_L1) / thumbnail.size
+                        < PREVIEW_STATIC_THRESHOLD
+                        and not (self.detector and self.detector.motion_active)
+                        and now - self._last_preview_time < PREVIEW_IDLE_INTERVAL):
+                    return
+                self._last_thumbnail = thumbnail
+                self._last_preview_time = now
                 
-                # Emit frame update (just the image)
-                socketio.emit('frame_update', {
-                    'frame': frame_data
-                })
+                height, width = frame.shape[:2]
+                
+                # Frame update (just the image, as a binary attachment); width and
+                # height give the camera resolution that ROI coordinates refer to
+                payload = {
+                    'frame': self._encode_jpeg(self._preview(frame)),
+                    'width': width,
+                    'height': height
+                }
+                
+                # Overwrite the single slot; a frame the sender has not taken yet is dropped
+                with self._frame_slot_lock:
+                    self._pending_frame = payload
+                    self._frame_slot_event.set()
+                    self._latest_jpeg = payload['frame']
+                    self._latest_jpeg_seq += 1
+                    self._jpeg_ready.notify_all()
         except Exception as e:
             logger.error(f"Failed to emit frame: {e}")
     
+    def wait_for_jpeg(self, last_seq: int, timeout: float = 1.0):
+        """Wait for a preview JPEG newer than last_seq; returns (jpeg or None, seq)"""
+        with self._jpeg_ready:
+            # Before the first frame there is nothing to return whatever last_seq is, so
+            # keep waiting instead of letting callers spin on an immediate None
+            self._jpeg_ready.wait_for(
+                lambda: self._latest_jpeg is not None and self._latest_jpeg_seq != last_seq, timeout)
+            if self._latest_jpeg is None or self._latest_jpeg_seq == last_seq:
+                return None, last_seq
+            return self._latest_jpeg, self._latest_jpeg_seq
+    
+    def get_snapshot(self):
+        """Full-resolution JPEG of the latest frame, or None before the first frame"""
+        with self._snapshot_lock:
+            if self._snapshot_frame is None:
+                return None
+            return self._encode_jpeg(self._snapshot_frame)
+    
     def get_roi_list(self) -> list:
-        """Get current ROI list"""
+        """Get current ROI list (rebuilt only when the detector's ROIs have changed)"""
         if not self.detector:
             return []
         
+        cache_key = (self.detector, self.detector.roi_revision)
+        if (self._roi_cache_key is not None and self._roi_cache_key[0] is cache_key[0]
+                and self._roi_cache_key[1] == cache_key[1]):
+            return self._roi_cache
+        
         roi_list = []
         for roi in self.detector.rois:
             x1, y1, x2, y2 = roi['coords']
@@ -224,6 +520,8 @@ class WebDetector:
             }
             roi_list.append(roi_info)
         
+        self._roi_cache = roi_list
+        self._roi_cache_key = cache_key
         return roi_list
 
 # Global web detector instance
@@ -308,9 +606,31 @@ def api_camera_status():
     return jsonify({
         'camera_active': web_detector.camera_active,
         'stats': web_detector.stats,
-        'roi_count': len(web_detector.get_roi_list())
+        'roi_count': web_detector.detector.roi_count if web_detector.detector else 0
     })
 
+@app.route('/api/snapshot')
+def api_snapshot():
+    """Full-resolution JPEG of the latest camera frame"""
+    snapshot = web_detector.get_snapshot()
+    if snapshot is None:
+        return jsonify({'success': False, 'error': 'No frame available'}), 404
+    return Response(snapshot, mimetype='image/jpeg')
+
+@app.route('/video.mjpg')
+def video_mjpg():
+    """Live preview as an MJPEG stream, playable directly in an <img> tag"""
+    def generate():
+        seq = -1
+        while web_detector.camera_active:
+            jpeg, seq = web_detector.wait_for_jpeg(seq)
+            if jpeg is None:
+                continue
+            yield (b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ' +
+                   str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n')
+    
+    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
 @app.route('/api/status')
 def api_status():
     """Get overall system status (Vue frontend expects this)"""
@@ -533,6 +853,7 @@ def api_motion_config():
 def on_connect():
     """Client connected"""
     logger.info('Client connected')
+    join_room(VIDEO_ROOM)
     emit('status', {'connected': True})
 
 @socketio.on('disconnect')
@@ -547,8 +868,8 @@ def start_global_sleep_prevention():
         # Import here to avoid circular imports
         from src.detector import SleepPrevention
         global_sleep_prevention = SleepPrevention()
-        global_sleep_prevention.start()
-        logger.info("Global sleep prevention started for web app")
+        if global_sleep_prevention.start():
+            logger.info("Global sleep prevention started for web app")
     except Exception as e:
         logger.warning(f"Failed to start sleep prevention: {e}")
 
@@ -34,6 +34,7 @@ export const useDetectorStore = defineStore('detector', () => {
   const isConnected = ref(false)
   const isSystemInitialized = ref(false)
   const currentFrame = ref<string>('')
+  const frameSize = ref({ width: 0, height: 0 })  // Camera resolution; the preview may be smaller
   const rois = ref<ROI[]>([])
   const stats = ref<DetectorStats>({
     camera_status: 'disconnected',
@@ -88,7 +89,15 @@ export const useDetectorStore = defineStore('detector', () => {
     })
     
     socket.on('frame_update', (data) => {
-      currentFrame.value = data.frame
+      // Frames arrive as raw JPEG bytes; show them through a blob URL and free the previous one
+      const previousFrame = currentFrame.value
+      currentFrame.value = URL.createObjectURL(new Blob([data.frame], { type: 'image/jpeg' }))
+      if (previousFrame) {
+        URL.revokeObjectURL(previousFrame)
+      }
+      if (data.width && data.height) {
+        frameSize.value = { width: data.width, height: data.height }
+      }
     })
     
     socket.on('stats_update', (data) => {
@@ -367,6 +376,7 @@ export const useDetectorStore = defineStore('detector', () => {
     isConnected,
     isSystemInitialized,
     currentFrame,
+    frameSize,
     rois,
     stats,
     config,